@@ -0,0 +1,108 @@
+"""
+Leo Howard, Copyright 2025.
+
+Simple on-disk cache for API responses so repeated runs skip the network.
+DataFrames are stored as parquet files, everything else as JSON.
+
+pip install pandas pyarrow
+
+Usage:
+cache = FileCache()
+key = make_key("AAPL", "info")
+info = cache.get_or_fetch(key, ONE_DAY, lambda: yf.Ticker("AAPL").info)
+
+@cached(ttl_days=90)
+def get_cik_from_ticker(ticker): ...
+"""
+
+import os
+import json
+import time
+import hashlib
+import functools
+import pandas as pd
+
+CACHE_DIR = os.path.join(".", "data", ".cache")
+ONE_DAY = 24 * 60 * 60  # seconds
+
+# Build a cache key from (ticker, endpoint, params)
+def make_key(ticker, endpoint, params=None):
+    raw = f"{ticker}:{endpoint}:{sorted((params or {}).items())}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+class FileCache:
+    """
+    File cache keyed by make_key(). Each entry is a <key>.json file holding the
+    timestamp, TTL and payload; DataFrame payloads live next to it in <key>.parquet.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def get(self, key):
+        """Return the cached value, or None if it is missing or expired."""
+        try:
+            with open(self._path(key, "json"), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["ts"] > entry["ttl"]:
+                return None
+            if entry.get("kind") == "dataframe":
+                return pd.read_parquet(self._path(key, "parquet"))
+            return entry["payload"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key, value, ttl):
+        """Store a value for ttl seconds."""
+        entry = {"ts": time.time(), "ttl": ttl}
+        if isinstance(value, pd.DataFrame):
+            value.to_parquet(self._path(key, "parquet"))
+            entry["kind"] = "dataframe"
+        else:
+            entry["kind"] = "json"
+            entry["payload"] = value
+        with open(self._path(key, "json"), "w", encoding="utf-8") as f:
+            json.dump(entry, f, default=str)
+
+    def get_or_fetch(self, key, ttl, fetch_fn):
+        """Return the cached value, calling fetch_fn() and caching its result on a miss."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = fetch_fn()
+        # Don't cache empty results - they are usually a failed request
+        if value is None or (isinstance(value, pd.DataFrame) and value.empty):
+            return value
+        self.set(key, value, ttl)
+        return value
+
+# Decorator: cache a function's JSON-serializable result on disk, keyed on its name and arguments
+def cached(ttl_days, cache_dir=CACHE_DIR, cache_if=None):
+    """
+    Return the cached result when the same call was made less than ttl_days ago.
+    None results (and results where cache_if(result) is False) are not cached,
+    so failed lookups are retried on the next run.
+    """
+    store = FileCache(cache_dir)
+    ttl = ttl_days * ONE_DAY
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            call = json.dumps([args, kwargs], sort_keys=True, default=str)
+            key = make_key(fn.__name__, "call", {"args": call})
+            result = store.get(key)
+            if result is not None:
+                return result
+
+            result = fn(*args, **kwargs)
+            if result is not None and (cache_if is None or cache_if(result)):
+                store.set(key, result, ttl)
+            return result
+        return wrapper
+    return decorator
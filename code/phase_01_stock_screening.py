@@ -9,7 +9,7 @@ finance_llm_python_venv/Scripts/activate
 python -c "import sys; print(sys.executable)"
 
 Install libs:
-pip install pandas yfinance requests python-edgar numpy lxml html5lib
+pip install pandas yfinance curl_cffi requests python-edgar numpy numba lxml html5lib pyarrow
 
 python code/phase_01_stock_screening.py
 """
@@ -17,9 +17,23 @@ python code/phase_01_stock_screening.py
 import pandas as pd
 import yfinance as yf
 import numpy as np
-import time
+import math
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from numba import njit, prange
+import asyncio
 from datetime import datetime, timedelta
 import os
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor
+from curl_cffi import CurlHttpVersion, requests as curl_requests
+from cache import FileCache, make_key, ONE_DAY
+from yfinance.exceptions import YFRateLimitError
+from rate_limiter import TokenBucket, call_with_backoff
+
+# Intermediate output of add_all_screening_metrics(), read by calculate_screening_scores()
+RAW_SCREENING_DATA_PATH = "data/03_va_sp500_raw_screening_data.parquet"
 
 # Screening weights configuration
 SCREENING_WEIGHTS = {
@@ -31,39 +45,101 @@ SCREENING_WEIGHTS = {
     'short_squeeze_score': 0.10
 }
 
-# Time delay to respect API limits
-def time_delay():
-    time.sleep(0.1)
-
-# Function to fetch S&P 500 tickers
+# Score column for each weight, and the weights as a vector in the same order,
+# so the composite score is one matrix-vector product
+SCORE_COLUMN_BY_WEIGHT = {
+    'volume_score': 'Volume_Score',
+    'price_change_score': 'Price_Change_Score',
+    'relative_strength_score': 'Relative_Strength_Score',
+    'historical_vol_score': 'Historical_Vol_Score',
+    'options_score': 'Options_Score',
+    'short_squeeze_score': 'Short_Squeeze_Score'
+}
+SCORE_COLUMNS = list(SCORE_COLUMN_BY_WEIGHT.values())
+SCORE_WEIGHT_VECTOR = np.array([SCREENING_WEIGHTS[key] for key in SCORE_COLUMN_BY_WEIGHT], dtype=np.float32)
+
+# On-disk cache for yfinance responses (see code/cache.py)
+cache = FileCache()
+PRICE_CACHE_TTL = ONE_DAY
+FINANCIALS_CACHE_TTL = 7 * ONE_DAY
+SP500_CACHE_TTL = 7 * ONE_DAY
+
+# One HTTP session shared by every pipeline stage (Yahoo and Wikipedia) so connections,
+# TLS handshakes and Yahoo's cookie/crumb are reused. HTTP/2 multiplexes requests to the
+# same host over one connection. yfinance only accepts curl_cffi sessions (it ships
+# curl_cffi as a dependency), so this can't be an httpx/requests client.
+_shared_session = curl_requests.Session(impersonate="chrome", timeout=10,
+                                        http_version=CurlHttpVersion.V2TLS)
+
+# Memoized Ticker construction so every stage reuses the same object and its lazy caches
+@functools.lru_cache(maxsize=1024)
+def _ticker(sym):
+    return yf.Ticker(sym, session=_shared_session)
+
+# Benchmark for relative strength, downloaded together with the screened tickers
+BENCHMARK_TICKER = "SPY"
+
+# Columns returned by compute_price_metrics()
+PRICE_METRIC_COLUMNS = [
+    'hist_vol_1y', 'volume_ratio', 'avg_volume_20d',
+    'change_1d', 'change_5d', 'change_20d', 'avg_volume_5d'
+]
+
+# Concurrency settings for the info/options fetch stage
+MAX_CONCURRENT_REQUESTS = 8
+PRICE_DOWNLOAD_RETRIES = 2  # Extra rounds for tickers missing from a batch download
+
+# yfinance swallows errors by default (e.g. .financials returns an empty frame when
+# rate-limited); let them raise so yahoo_call can back off and retry
+yf.config.debug.hide_exceptions = False
+
+# Rate limiters shared by all worker threads, one per Yahoo endpoint type.
+# They only slow down further when Yahoo answers with a rate-limit error.
+price_limiter = TokenBucket(rate=60, per=60.0)
+info_limiter = TokenBucket(rate=5, per=1.0)
+financials_limiter = TokenBucket(rate=5, per=1.0)
+
+# Call a yfinance fetch under a limiter, backing off and retrying on rate-limit errors
+def yahoo_call(limiter, fetch_fn):
+    return call_with_backoff(limiter, fetch_fn, rate_limit_errors=(YFRateLimitError,))
+
+# Write a DataFrame to CSV with pyarrow's multi-threaded C++ writer (much faster than df.to_csv)
+def write_csv(df, path):
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
+# Function to scrape the S&P 500 ticker list from Wikipedia
+def fetch_sp500_tickers_from_wikipedia():
+    # Add headers to mimic a real browser request
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+    
+    # Use the shared session to get the page with headers, then pass to pandas
+    response = _shared_session.get(url, headers=headers)
+    response.raise_for_status()  # Raises an HTTPError for bad responses
+    
+    # Parse the HTML content with pandas
+    tables = pd.read_html(io.StringIO(response.text))
+    print("✅ Wikipedia tables found:", len(tables))
+    df = tables[0]
+
+    # Handle possible column name differences
+    if 'Symbol' in df.columns:
+        col = 'Symbol'
+    elif 'Ticker symbol' in df.columns:
+        col = 'Ticker symbol'
+    else:
+        raise ValueError("No ticker column found in Wikipedia table")
+
+    return df[col].tolist()
+
+# Function to fetch S&P 500 tickers (re-scraped at most once a week)
 def get_sp500_tickers():
     try:
-        # Add headers to mimic a real browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-        
-        # Use requests to get the page with headers, then pass to pandas
-        import requests
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Raises an HTTPError for bad responses
-        
-        # Parse the HTML content with pandas
-        tables = pd.read_html(response.content)
-        print("✅ Wikipedia tables found:", len(tables))
-        df = tables[0]
-
-        # Handle possible column name differences
-        if 'Symbol' in df.columns:
-            col = 'Symbol'
-        elif 'Ticker symbol' in df.columns:
-            col = 'Ticker symbol'
-        else:
-            raise ValueError("No ticker column found in Wikipedia table")
-
-        tickers = df[col].tolist()
+        tickers = cache.get_or_fetch(make_key("SP500", "wikipedia_tickers"), SP500_CACHE_TTL,
+                                     fetch_sp500_tickers_from_wikipedia)
         print(f"✅ Successfully retrieved {len(tickers)} S&P 500 tickers")
         return tickers
 
@@ -83,7 +159,32 @@ def create_dataframe_with_tickers(test_mode=False, test_count=10):
     
     df = pd.DataFrame(tickers, columns=["Ticker"])
     output_path = "data/01_va_sp500_tickers.csv"
-    df.to_csv(output_path, index=False)
+    write_csv(df, output_path)
+
+# Fetch one ticker's net income (runs in a worker thread):
+def _fetch_net_income(ticker):
+    """
+    Return the net income for the last 3 fiscal periods, most recent first,
+    or None if it isn't available.
+    """
+    # Using a try-except block to gracefully handle any API or data fetching issues
+    try:
+        financials_df = cache.get_or_fetch(make_key(ticker, "financials"), FINANCIALS_CACHE_TTL,
+                                           lambda: yahoo_call(financials_limiter, lambda: _ticker(ticker).financials))
+
+        # Check if 'Net Income' exists in the index and if there's enough data
+        if 'Net Income' not in financials_df.index or len(financials_df.columns) < 3:
+            return None
+
+        # Get the net income for the last 3 fiscal periods (most recent 3 columns)
+        # yfinance financials are usually in descending order of year, so [0] is most recent, [2] is oldest
+        return financials_df.loc['Net Income'].iloc[:3].to_numpy(dtype=np.float64)
+
+    except Exception as e:
+        # Print a message for any specific ticker that causes an error, then continue
+        print(f"⚠️ Skipping {ticker} due to an error during net income check: {e}")
+
+    return None
 
 # Filter by net income:
 def filter_by_net_income():
@@ -99,121 +200,211 @@ def filter_by_net_income():
     if not os.path.exists(input_path):
         print("❌ Input file not found:", input_path)
         # Create an empty CSV if the input file doesn't exist to prevent further errors
-        pd.DataFrame(columns=['Ticker']).to_csv(output_path, index=False)
+        write_csv(pd.DataFrame(columns=['Ticker'], dtype=str), output_path)
         return
 
     df = pd.read_csv(input_path)
-    tickers_to_keep = []
     print("⏳ Filtering stocks by net income for the last 3 years...")
 
-    for idx, ticker in enumerate(df['Ticker']):
-        # Using a try-except block to gracefully handle any API or data fetching issues
-        try:
-            time_delay() # Delay to respect API limits
-            stock = yf.Ticker(ticker)
-            financials_df = stock.financials
-
-            # Check if 'Net Income' exists in the index and if there's enough data
-            if 'Net Income' not in financials_df.index or len(financials_df.columns) < 3:
-                continue
+    # Fetch financials in parallel - the work is almost entirely network wait
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as ex:
+        net_incomes = list(ex.map(_fetch_net_income, df['Ticker']))
 
-            # Get the net income for the last 3 fiscal periods (most recent 3 columns)
-            net_income_series = financials_df.loc['Net Income'].iloc[:3]
+    # Stack into an (N_tickers, 3) array and check every ticker in one vectorized pass
+    tickers = [t for t, ni in zip(df['Ticker'], net_incomes) if ni is not None]
+    ni = np.vstack([ni for ni in net_incomes if ni is not None]) if tickers else np.empty((0, 3))
 
-            # Condition 1: All net income values must be positive
-            is_positive = (net_income_series > 0).all()
+    # Condition 1: All net income values must be positive
+    is_positive = (ni > 0).all(axis=1)
 
-            # Condition 2: Net income must not decrease (from oldest to newest of the three)
-            # yfinance financials are usually in descending order of year, so [0] is most recent, [2] is oldest
-            is_non_decreasing = (net_income_series.iloc[2] <= net_income_series.iloc[1]) and \
-                                (net_income_series.iloc[1] <= net_income_series.iloc[0])
+    # Condition 2: Net income must not decrease (from oldest to newest of the three)
+    is_non_decreasing = (ni[:, 2] <= ni[:, 1]) & (ni[:, 1] <= ni[:, 0])
 
-            if is_positive and is_non_decreasing:
-                tickers_to_keep.append(ticker)
-
-        except Exception as e:
-            # Print a message for any specific ticker that causes an error, then continue
-            print(f"⚠️ Skipping {ticker} due to an error during net income check: {e}")
-            continue
+    tickers_to_keep = np.array(tickers, dtype=object)[is_positive & is_non_decreasing].tolist()
 
     # Save the filtered tickers to a new CSV file
     filtered_df = pd.DataFrame(tickers_to_keep, columns=['Ticker'])
-    filtered_df.to_csv(output_path, index=False)
+    write_csv(filtered_df, output_path)
     print(f"✅ Filtered down to {len(tickers_to_keep)} tickers, saved to {output_path}")
 
-# Function to get all screening metrics in one API call
-def get_all_screening_metrics(ticker):
+# Function to download price history for all tickers in one batched call
+def download_price_history(tickers, period="1y"):
+    """
+    Download daily price history for every ticker in a single yfinance call.
+    The cached histories are used only if every ticker has one (or is cached as having
+    no data); otherwise all tickers are fetched again in one batch, so cached and fresh
+    frames are never mixed.
+    Returns a DataFrame with (Ticker, Field) MultiIndex columns.
+    """
+    frames = {}
+    missing = []
+    for ticker in tickers:
+        hist = cache.get(make_key(ticker, "history", {"period": period}))
+        if hist is not None:
+            frames[ticker] = hist
+        elif not cache.get(make_key(ticker, "history_unavailable", {"period": period})):
+            missing.append(ticker)
+    
+    if missing:
+        frames = {}
+        to_fetch = list(tickers)
+        # yf.download records per-ticker failures (including rate limits) instead of raising,
+        # so tickers that come back empty are retried after backing off
+        for attempt in range(PRICE_DOWNLOAD_RETRIES + 1):
+            if attempt:
+                price_limiter.backoff()
+            data = yahoo_call(price_limiter, lambda: yf.download(
+                to_fetch, period=period, group_by='ticker',
+                threads=True, auto_adjust=True, progress=False, session=_shared_session))
+            for ticker in set(data.columns.get_level_values(0)):
+                hist = data[ticker].dropna()
+                if not hist.empty:
+                    cache.set(make_key(ticker, "history", {"period": period}), hist, PRICE_CACHE_TTL)
+                    frames[ticker] = hist
+            to_fetch = [t for t in to_fetch if t not in frames]
+            if not to_fetch:
+                break
+        price_limiter.reset_backoff()
+        
+        # Remember tickers that returned no history, so they don't force a full re-download every run
+        for ticker in to_fetch:
+            cache.set(make_key(ticker, "history_unavailable", {"period": period}), True, PRICE_CACHE_TTL)
+    
+    return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+# Numba kernel: annualized volatility of daily log returns for each column of a (dates x tickers) close matrix
+@njit(parallel=True, cache=True)
+def hist_vol_kernel(closes):
+    """
+    Same result as np.log(closes / closes.shift(1)).std() * sqrt(252) per column:
+    sample std (ddof=1), skipping days where either close is missing (NaN) or not positive.
+    """
+    T, N = closes.shape
+    out = np.empty(N, np.float64)
+    for j in prange(N):
+        s = 0.0
+        s2 = 0.0
+        n = 0
+        for i in range(1, T):
+            # NaN > 0 is False, so this also skips missing prices
+            if closes[i, j] > 0 and closes[i - 1, j] > 0:
+                r = math.log(closes[i, j] / closes[i - 1, j])
+                s += r
+                s2 += r * r
+                n += 1
+        if n > 1:
+            var = (s2 - s * s / n) / (n - 1)
+            out[j] = math.sqrt(max(var, 0.0) * 252)
+        else:
+            out[j] = np.nan
+    return out
+
+# Function to keep each column's last n non-missing values, bottom-aligned
+def last_valid_rows(frame, n):
+    """
+    Row -1 of the result is each ticker's own latest bar, row -2 the one before, etc.
+    A ticker with no bar on the newest dates (halted, stale history) is not read as NaN.
     """
-    Get all screening metrics for a ticker in a single function to minimize API calls:
+    values = frame.to_numpy(dtype=np.float64)
+    # Stable sort on "is valid" moves each column's NaNs to the top, keeping the order of the rest
+    order = np.argsort(~np.isnan(values), axis=0, kind='stable')
+    aligned = np.take_along_axis(values, order, axis=0)[-n:]
+    return pd.DataFrame(aligned, columns=frame.columns)
+
+# Function to compute the price and volume screening metrics for all tickers at once
+def compute_price_metrics(price_data):
+    """
+    Compute the history-based screening metrics for every ticker in one vectorized pass
+    over the (dates x tickers) Close and Volume matrices from the batch download:
     - Historical volatility (1 year)
     - Volume metrics (current vs 20-day average)
     - Price changes (1d, 5d, 20d)
+    - Average volume over the last 5 days (used by the options metrics)
+    Returns a DataFrame indexed by ticker. Options and short interest metrics are
+    fetched concurrently by fetch_all_info_and_options().
+    """
+    if price_data.empty:
+        return pd.DataFrame(columns=PRICE_METRIC_COLUMNS)
+    
+    closes = price_data.xs('Close', axis=1, level=1)
+    volumes = price_data.xs('Volume', axis=1, level=1)
+    
+    # 1. Historical Volatility (1 year) - needs more than 50 days of history
+    hist_vol = pd.Series(hist_vol_kernel(closes.to_numpy(dtype=np.float64)), index=closes.columns)
+    hist_vol = hist_vol.where(closes.count() > 50)
+    
+    # The 30 day window is the tail of each ticker's own 1 year history
+    closes_30d = last_valid_rows(closes, 30)
+    volumes_30d = last_valid_rows(volumes, 30)
+    
+    # 2. Volume Metrics (30 day) - needs at least 20 days
+    has_20d = volumes_30d.count() >= 20
+    avg_volume_20d = volumes_30d.tail(20).mean()  # only the last window is needed, no rolling series
+    volume_ratio = (volumes_30d.iloc[-1] / avg_volume_20d).where(avg_volume_20d > 0, 0)
+    
+    # 3. Price Change Metrics (30 day) - needs at least 21 days
+    has_21d = closes_30d.count() >= 21
+    current_price = closes_30d.iloc[-1]
+    
+    def change_since(days_ago):
+        if len(closes_30d) <= days_ago:
+            return pd.Series(np.nan, index=closes.columns)
+        past_price = closes_30d.iloc[-(days_ago + 1)]
+        change = ((current_price - past_price) / past_price * 100).where(past_price > 0, 0)
+        return change.round(2).where(has_21d)
+    
+    return pd.DataFrame({
+        'hist_vol_1y': hist_vol.round(2),
+        'volume_ratio': volume_ratio.round(2).where(has_20d),
+        'avg_volume_20d': np.trunc(avg_volume_20d).where(has_20d),
+        'change_1d': change_since(1),
+        'change_5d': change_since(5),
+        'change_20d': change_since(20),
+        'avg_volume_5d': volumes_30d.tail(5).mean()
+    })
+
+# Function to sum call/put volume on the nearest expiry
+def get_option_volumes(stock):
+    """Return {'call_volume', 'put_volume'} for the nearest expiry, or {} if the ticker has no options."""
+    # Pick nearest expiry (first available)
+    expirations = stock.options
+    if not expirations:
+        return {}
+    chain = stock.option_chain(expirations[0])
+    
+    # Handle NaN volumes properly
+    return {
+        'call_volume': float(chain.calls['volume'].fillna(0).sum()),
+        'put_volume': float(chain.puts['volume'].fillna(0).sum())
+    }
+
+# Function to get the options and short interest metrics for a ticker
+def get_info_and_options_metrics(ticker, avg_stock_volume):
+    """
+    Fetch info and the nearest option chain for a ticker (blocking network calls).
+    avg_stock_volume is the 5 day average volume from the batch price download.
     - Options metrics (simplified)
     - Short interest metrics
     """
     try:
-        time_delay()
-        stock = yf.Ticker(ticker)
-        
-        # Get both 1 year and 30 day history in one call each
-        hist_1y = stock.history(period="1y")
-        hist_30d = stock.history(period="30d") 
-        info = stock.info
+        stock = _ticker(ticker)
+        info = cache.get_or_fetch(make_key(ticker, "info"), PRICE_CACHE_TTL, lambda: yahoo_call(info_limiter, lambda: stock.info))
         
         # Initialize return values
         results = {}
         
-        # 1. Historical Volatility (1 year)
-        if not hist_1y.empty and len(hist_1y) > 50:
-            hist_1y['Log Returns'] = np.log(hist_1y['Close'] / hist_1y['Close'].shift(1))
-            hist_vol = hist_1y['Log Returns'].std() * np.sqrt(252)
-            results['hist_vol_1y'] = round(hist_vol, 2)
-        else:
-            results['hist_vol_1y'] = np.nan
-        
-        # 2. Volume Metrics (30 day)
-        if not hist_30d.empty and len(hist_30d) >= 20:
-            current_volume = hist_30d['Volume'].iloc[-1]
-            avg_volume_20d = hist_30d['Volume'].rolling(20).mean().iloc[-1]
-            volume_ratio = current_volume / avg_volume_20d if avg_volume_20d > 0 else 0
-            results['volume_ratio'] = round(volume_ratio, 2)
-            results['avg_volume_20d'] = int(avg_volume_20d)
-        else:
-            results['volume_ratio'] = np.nan
-            results['avg_volume_20d'] = np.nan
-        
-        # 3. Price Change Metrics (30 day)
-        if not hist_30d.empty and len(hist_30d) >= 21:
-            current_price = hist_30d['Close'].iloc[-1]
-            price_1d = hist_30d['Close'].iloc[-2] if len(hist_30d) >= 2 else current_price
-            price_5d = hist_30d['Close'].iloc[-6] if len(hist_30d) >= 6 else current_price
-            price_20d = hist_30d['Close'].iloc[-21] if len(hist_30d) >= 21 else current_price
-            
-            results['change_1d'] = round(((current_price - price_1d) / price_1d * 100), 2) if price_1d > 0 else 0
-            results['change_5d'] = round(((current_price - price_5d) / price_5d * 100), 2) if price_5d > 0 else 0
-            results['change_20d'] = round(((current_price - price_20d) / price_20d * 100), 2) if price_20d > 0 else 0
-        else:
-            results['change_1d'] = np.nan
-            results['change_5d'] = np.nan
-            results['change_20d'] = np.nan
-        
         # 4. Options Metrics (from info) - FIXED VERSION
         try:
-            stock = yf.Ticker(ticker)
-            # Pick nearest expiry (first available)
-            expirations = stock.options
-            if expirations:
-                exp_date = expirations[0]
-                chain = stock.option_chain(exp_date)
-                
-                # Handle NaN volumes properly
-                call_volume = chain.calls['volume'].fillna(0).sum()
-                put_volume = chain.puts['volume'].fillna(0).sum()
+            option_volumes = cache.get_or_fetch(make_key(ticker, "option_chain"), PRICE_CACHE_TTL,
+                                                lambda: yahoo_call(info_limiter, lambda: get_option_volumes(stock)))
+            if option_volumes:
+                call_volume = option_volumes['call_volume']
+                put_volume = option_volumes['put_volume']
                 total_opt_volume = call_volume + put_volume
                 
-                # Get average stock volume
-                hist = stock.history(period="5d")
-                avg_stock_volume = hist['Volume'].mean() if not hist.empty else 1
+                # Average stock volume comes from the batch history - no extra request
+                if pd.isna(avg_stock_volume):
+                    avg_stock_volume = 1
                 
                 # Only calculate if there's actual volume
                 if total_opt_volume > 0:
@@ -234,24 +425,40 @@ def get_all_screening_metrics(ticker):
         results['options_proxy'] = round(options_proxy, 4) if options_proxy is not None else None
         results['put_call_proxy'] = round(put_call_proxy, 4) if put_call_proxy is not None else None
         
-        # 5. Short Interest Metrics (from info)
-        results['short_ratio'] = round(info.get('shortRatio', 0), 2)
-        results['short_percent'] = round(info.get('shortPercentOfFloat', 0), 2)
+        # 5. Short Interest Metrics (from info) - missing stays NaN instead of looking like a real 0
+        short_ratio = info.get('shortRatio')
+        short_percent = info.get('shortPercentOfFloat')
+        results['short_ratio'] = round(short_ratio, 2) if short_ratio is not None else np.nan
+        results['short_percent'] = round(short_percent, 2) if short_percent is not None else np.nan
         
         return results
         
     except Exception:
         return {
-            'hist_vol_1y': np.nan, 'volume_ratio': np.nan, 'avg_volume_20d': np.nan,
-            'change_1d': np.nan, 'change_5d': np.nan, 'change_20d': np.nan,
             'options_proxy': np.nan, 'put_call_proxy': np.nan,
             'short_ratio': np.nan, 'short_percent': np.nan
         }
 
+# Fetch info/options for one ticker without blocking the event loop
+async def fetch_ticker(sem, ticker, avg_stock_volume):
+    async with sem:
+        return await asyncio.to_thread(get_info_and_options_metrics, ticker, avg_stock_volume)
+
+# Function to fetch info/options for all tickers concurrently
+async def fetch_all_info_and_options(tickers, avg_stock_volumes):
+    """
+    Run get_info_and_options_metrics() for every ticker with at most
+    MAX_CONCURRENT_REQUESTS requests in flight. Results are in ticker order.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return await asyncio.gather(*[fetch_ticker(sem, ticker, avg_volume)
+                                  for ticker, avg_volume in zip(tickers, avg_stock_volumes)])
+
 # Function to normalize scores using percentile ranking
 def normalize_score(values):
-    """Convert values to 0-100 percentile scores"""
-    values = pd.Series(values)
+    """Convert values to 0-100 percentile scores (a DataFrame is ranked column by column)"""
+    if not isinstance(values, pd.DataFrame):
+        values = pd.Series(values)
     return values.rank(pct=True) * 100
 
 # Function to collect all screening metrics in one pass
@@ -263,99 +470,107 @@ def add_all_screening_metrics():
     
     df = pd.read_csv(input_path)
     
-    # Initialize all columns
-    all_columns = [
-        'Historical Vol Past 1 Year', 'Volume_Ratio', 'Avg_Volume_20d', 
-        'Price_Change_1d', 'Price_Change_5d', 'Price_Change_20d',
-        'Options_Proxy', 'Put_Call_Proxy', 'Short_Ratio', 'Short_Percent'
-    ]
+    # Output column for each metric key
+    metric_columns = {
+        'hist_vol_1y': 'Historical Vol Past 1 Year', 'volume_ratio': 'Volume_Ratio',
+        'avg_volume_20d': 'Avg_Volume_20d', 'change_1d': 'Price_Change_1d',
+        'change_5d': 'Price_Change_5d', 'change_20d': 'Price_Change_20d',
+        'options_proxy': 'Options_Proxy', 'put_call_proxy': 'Put_Call_Proxy',
+        'short_ratio': 'Short_Ratio', 'short_percent': 'Short_Percent'
+    }
     
-    for col in all_columns:
-        df[col] = np.nan
+    # Fetch 1 year of history for every ticker (plus the benchmark) in one batched request
+    print(f"⏳ Downloading price history for {len(df)} tickers...")
+    price_data = download_price_history(dict.fromkeys([*df['Ticker'], BENCHMARK_TICKER]))
     
-    # Fetch all metrics for each ticker in one function call
+    # Compute the price/volume metrics for all tickers in one vectorized pass
+    price_metrics = compute_price_metrics(price_data).reindex(df['Ticker'])
+    
+    # Fetch info and option chains for all tickers concurrently
+    print(f"⏳ Fetching info and option chains for {len(df)} tickers...")
+    info_metrics = asyncio.run(fetch_all_info_and_options(list(df['Ticker']), price_metrics['avg_volume_5d'].tolist()))
+    
+    # Combine the price metrics with the info/options metrics for each ticker
+    records = []
     for idx, ticker in enumerate(df['Ticker']):
-        # Get all metrics in one call
-        metrics = get_all_screening_metrics(ticker)
-        
-        # Assign all values
-        df.at[idx, 'Historical Vol Past 1 Year'] = metrics['hist_vol_1y']
-        df.at[idx, 'Volume_Ratio'] = metrics['volume_ratio']
-        df.at[idx, 'Avg_Volume_20d'] = metrics['avg_volume_20d']
-        df.at[idx, 'Price_Change_1d'] = metrics['change_1d']
-        df.at[idx, 'Price_Change_5d'] = metrics['change_5d']
-        df.at[idx, 'Price_Change_20d'] = metrics['change_20d']
-        df.at[idx, 'Options_Proxy'] = metrics['options_proxy']
-        df.at[idx, 'Put_Call_Proxy'] = metrics['put_call_proxy']
-        df.at[idx, 'Short_Ratio'] = metrics['short_ratio']
-        df.at[idx, 'Short_Percent'] = metrics['short_percent']
-    
-    output_path = "data/03_va_sp500_raw_screening_data.csv"
-    df.to_csv(output_path, index=False)
+        metrics = {**price_metrics.loc[ticker].to_dict(), **info_metrics[idx]}
+        records.append({'Ticker': ticker, **{col: metrics.get(key, np.nan) for key, col in metric_columns.items()}})
+    
+    # Build the metrics table once and join it onto the tickers
+    metrics_df = pd.DataFrame(records, columns=['Ticker', *metric_columns.values()])
+    
+    # float32 halves the bandwidth of the rank/score passes; Avg_Volume_20d stays
+    # float64 because volumes above 2**24 are not exact in float32
+    float32_columns = [col for col in metric_columns.values() if col != 'Avg_Volume_20d']
+    metrics_df = metrics_df.astype({col: 'float32' for col in float32_columns})
+    df = df.merge(metrics_df, on='Ticker', how='left')
+    
+    # Parquet keeps the dtypes and is much faster to read back in the next step than CSV
+    output_path = RAW_SCREENING_DATA_PATH
+    df.to_parquet(output_path, index=False)
 
 # Function to calculate weighted composite scores
 def calculate_screening_scores():
     """
     Calculate screening scores using the single weight configuration.
     """
-    input_path = "data/03_va_sp500_raw_screening_data.csv"
+    input_path = RAW_SCREENING_DATA_PATH
     
     if not os.path.exists(input_path):
         return
     
-    df = pd.read_csv(input_path)
+    df = pd.read_parquet(input_path)
     
     # Get S&P 500 benchmark return (simplified - 20 day change)
     try:
-        spy = yf.Ticker("SPY")
-        spy_hist = spy.history(period="30d")
-        spy_return_20d = ((spy_hist['Close'].iloc[-1] - spy_hist['Close'].iloc[-21]) / spy_hist['Close'].iloc[-21] * 100)
-    except:
+        # The benchmark was fetched with the batch download, so this is a cache hit
+        spy_metrics = compute_price_metrics(download_price_history([BENCHMARK_TICKER]))
+        spy_return_20d = spy_metrics.loc[BENCHMARK_TICKER, 'change_20d']
+        if pd.isna(spy_return_20d):
+            spy_return_20d = 2.0  # Default benchmark
+    except Exception:
         spy_return_20d = 2.0  # Default benchmark
     
-    # Calculate individual scores (0-100 scale)
-    df['Volume_Score'] = normalize_score(df['Volume_Ratio'].fillna(0))
-    
-    # Price momentum score (weighted combination of timeframes)
+    # Collect every input that gets percentile-ranked so all ranks happen in one pass
     price_composite = (df['Price_Change_1d'].fillna(0) * 0.5 + 
                       df['Price_Change_5d'].fillna(0) * 0.3 + 
                       df['Price_Change_20d'].fillna(0) * 0.2)
-    df['Price_Change_Score'] = normalize_score(price_composite)
-    
-    # Relative strength score
-    relative_strength = df['Price_Change_20d'].fillna(0) - spy_return_20d
-    df['Relative_Strength_Score'] = normalize_score(relative_strength)
+    raw = pd.DataFrame({
+        'volume': df['Volume_Ratio'].fillna(0),
+        'price_composite': price_composite,                                  # Price momentum (weighted timeframes)
+        'relative_strength': df['Price_Change_20d'].fillna(0) - spy_return_20d,
+        'hist_vol': df['Historical Vol Past 1 Year'].fillna(0),              # Higher vol = higher score for potential big moves
+        'options_proxy': df['Options_Proxy'].fillna(0),
+        'put_call_proxy': df['Put_Call_Proxy'].fillna(1),
+        'short_percent': df['Short_Percent'].fillna(0),
+        'short_ratio': df['Short_Ratio'].fillna(0),
+        'price_change_5d': df['Price_Change_5d'].fillna(0)
+    })
+    ranks = normalize_score(raw)
     
-    # Historical volatility score (higher vol = higher score for potential big moves)
-    df['Historical_Vol_Score'] = normalize_score(df['Historical Vol Past 1 Year'].fillna(0))
+    # Calculate individual scores (0-100 scale)
+    df['Volume_Score'] = ranks['volume']
+    df['Price_Change_Score'] = ranks['price_composite']
+    df['Relative_Strength_Score'] = ranks['relative_strength']
+    df['Historical_Vol_Score'] = ranks['hist_vol']
     
     # Options score (simplified)
-    options_composite = (normalize_score(df['Options_Proxy'].fillna(0)) * 0.7 +
-                    normalize_score(df['Put_Call_Proxy'].fillna(1)) * 0.3)
-    df['Options_Score'] = options_composite
+    df['Options_Score'] = ranks['options_proxy'] * 0.7 + ranks['put_call_proxy'] * 0.3
     
     # Short squeeze score
-    squeeze_composite = (normalize_score(df['Short_Percent'].fillna(0)) * 0.5 + 
-                        normalize_score(df['Short_Ratio'].fillna(0)) * 0.3 +
-                        normalize_score(df['Price_Change_5d'].fillna(0)) * 0.2)
-    df['Short_Squeeze_Score'] = squeeze_composite
-    
-    # Calculate weighted composite score
-    df['Composite_Score'] = (
-        df['Volume_Score'] * SCREENING_WEIGHTS['volume_score'] +
-        df['Price_Change_Score'] * SCREENING_WEIGHTS['price_change_score'] +
-        df['Relative_Strength_Score'] * SCREENING_WEIGHTS['relative_strength_score'] +
-        df['Historical_Vol_Score'] * SCREENING_WEIGHTS['historical_vol_score'] +
-        df['Options_Score'] * SCREENING_WEIGHTS['options_score'] +
-        df['Short_Squeeze_Score'] * SCREENING_WEIGHTS['short_squeeze_score']
-    )
+    df['Short_Squeeze_Score'] = (ranks['short_percent'] * 0.5 + 
+                                 ranks['short_ratio'] * 0.3 +
+                                 ranks['price_change_5d'] * 0.2)
+    
+    # Calculate weighted composite score as a single dot product
+    df['Composite_Score'] = df[SCORE_COLUMNS].to_numpy(dtype=np.float32) @ SCORE_WEIGHT_VECTOR
     
     # Rank stocks by composite score
     df['Rank'] = df['Composite_Score'].rank(ascending=False)
     df = df.sort_values('Composite_Score', ascending=False)
     
     output_path = "data/04_va_sp500_screening_results.csv"
-    df.to_csv(output_path, index=False)
+    write_csv(df, output_path)
 
 # Add a historical volatility column next to tickers (DEPRECATED - now done in add_all_screening_metrics):
 def add_historical_vol():
@@ -8,27 +8,43 @@ Activate virtual env in Windows:
 finance_llm_python_venv/Scripts/activate
 python -c "import sys; print(sys.executable)"
 
-pip install requests beautifulsoup4 pandas lxml
+pip install requests pandas lxml orjson
 
 python code/phase_02_get_10K_forms.py
+python code/phase_02_get_10K_forms.py --force  # delete saved filings and download them again
 """
 
 import os
-import time
+import argparse
+import asyncio
+import functools
+import hashlib
+import io
+import logging
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
 from datetime import datetime, timedelta
-import random
 import re
-import json
 import shutil
-from urllib.parse import urljoin
+import orjson
+from rate_limiter import TokenBucket
+from cache import FileCache, make_key, cached, ONE_DAY
 
 CSV_FILE = "./data/02_va_sp500_filtered_by_net_income.csv"
 OUTPUT_DIR = os.path.join(".", "data", "10k_filings")
 MAX_FILINGS_PER_TICKER = 3  # Get last 3 years of 10-K filings
-REQUEST_DELAY = (1, 2)  # SEC allows up to 10 requests per second, but we'll be conservative
+MIN_SAVED_FILING_BYTES = 10_000  # Smaller saved files are treated as incomplete and re-downloaded
+logger = logging.getLogger(__name__)
+SEC_REQUESTS_PER_SECOND = 9  # SEC allows up to 10 requests per second; stay just under it
+MAX_CONCURRENT_TICKERS = 8  # Tickers processed at the same time
+
+# Download caps - clean_10k_text keeps at most 1MB of text anyway. Plain text is ~1 byte per char;
+# 10-K HTML is mostly inline XBRL markup, so it needs far more raw bytes per char of text.
+MAX_TEXT_BYTES = 1_200_000
+MAX_HTML_BYTES = 25_000_000
 
 # SEC EDGAR API configuration - FIXED User-Agent (SEC requires proper identification)
 SEC_BASE_URL = "https://www.sec.gov"
@@ -40,11 +56,90 @@ HEADERS = {
     'Connection': 'keep-alive'
 }
 
+# One pooled session for every SEC request so TCP/TLS connections are reused across calls
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=64,
+                       max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Global token bucket shared by all worker threads, so concurrent tickers together stay under the SEC limit
+SEC_LIMITER = TokenBucket(rate=SEC_REQUESTS_PER_SECOND, per=1.0)
+
+def sec_get(url, **kwargs):
+    """SESSION.get paced by the shared SEC rate limiter"""
+    SEC_LIMITER.acquire()
+    return SESSION.get(url, **kwargs)
+
+# SEC's ticker -> CIK mapping file (~1MB JSON covering ~13k companies)
+COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+COMPANY_TICKERS_TTL = 7 * ONE_DAY
+
+# On-disk cache under ./data/.cache (see code/cache.py)
+cache = FileCache()
+
+def load_company_tickers():
+    """
+    Load SEC's company tickers mapping once per run, re-downloading it at most once a week.
+    """
+    def fetch():
+        response = sec_get(COMPANY_TICKERS_URL, timeout=10)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    try:
+        return cache.get_or_fetch(make_key("SEC", "company_tickers"), COMPANY_TICKERS_TTL, fetch)
+    except Exception as e:
+        print(f"Error loading SEC company tickers: {e}")
+        return {}
+
+def build_cik_index(company_tickers):
+    """
+    Build a ticker -> zero-padded CIK dict so lookups are a single hash probe
+    instead of a scan over every company. The first entry wins for duplicate tickers.
+    """
+    cik_by_ticker = {}
+    for company_info in company_tickers.values():
+        if isinstance(company_info, dict) and company_info.get('cik_str') is not None:
+            cik_by_ticker.setdefault(company_info.get('ticker', '').upper(), str(company_info['cik_str']).zfill(10))
+    return cik_by_ticker
+
+parser = argparse.ArgumentParser(description="Download recent 10-K filings from SEC EDGAR")
+parser.add_argument("--force", action="store_true",
+                    help="Delete previously saved filings and download them again")
+args = parser.parse_args()
+
+# Existing filings are kept between runs and skipped (see process_ticker) unless --force is given
+if args.force:
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
-# Clear existing data
-shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+def is_downloaded_document(text):
+    """True if download_10k_document returned a document rather than an error message"""
+    return not text.startswith(("Error", "Could not", "No CIK"))
+
+# Hash of a cleaned filing, used to skip saving the same document twice for a ticker
+def content_hash(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+# Load the hashes of filings already saved for a ticker ("<hex digest> <filename>" per line).
+# A hash only counts while its file still exists, so a deleted filing is written again.
+def load_saved_hashes(hashes_path):
+    ticker_dir = os.path.dirname(hashes_path)
+    saved = set()
+    try:
+        with open(hashes_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split(maxsplit=1)
+                if len(parts) == 2 and os.path.exists(os.path.join(ticker_dir, parts[1].strip())):
+                    saved.add(parts[0])
+    except OSError:
+        pass
+    return saved
+
+@functools.lru_cache(maxsize=4096)  # In-process memo on top of the disk cache
+@cached(ttl_days=90)
 def get_cik_from_ticker(ticker):
     """
     Get the Central Index Key (CIK) for a given ticker symbol using SEC's company tickers mapping.
@@ -62,29 +157,21 @@ def get_cik_from_ticker(ticker):
         tickers_to_try.append(ticker_mappings[ticker.upper()])
     
     try:
-        # Use SEC's company tickers mapping file
-        url = "https://www.sec.gov/files/company_tickers.json"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Try each ticker variant
-            for try_ticker in tickers_to_try:
-                for key, company_info in data.items():
-                    if isinstance(company_info, dict) and company_info.get('ticker', '').upper() == try_ticker:
-                        cik = company_info.get('cik_str')
-                        if cik is not None:
-                            return str(cik).zfill(10)
+        # Use SEC's company tickers mapping file (indexed once at startup)
+        # Try each ticker variant
+        for try_ticker in tickers_to_try:
+            if try_ticker in CIK_BY_TICKER:
+                return CIK_BY_TICKER[try_ticker]
         
         # FALLBACK: Try company name search for known companies
         return search_by_company_name(ticker)
             
     except Exception as e:
-        pass  # Silently handle errors
+        logger.debug("CIK lookup failed for %s: %s", ticker, e)
     
     return None
 
+@functools.lru_cache(maxsize=4096)
 def search_by_company_name(ticker):
     """
     Search by company name for known ticker mappings
@@ -107,157 +194,74 @@ def search_by_company_name(ticker):
                 'count': '1'
             }
             
-            response = requests.get(search_url, headers=HEADERS, params=params, timeout=15)
+            response = sec_get(search_url, params=params, timeout=15)
             if response.status_code == 200:
                 # Try to extract CIK from response
                 cik_match = re.search(r'CIK=(\d+)', response.text)
                 if cik_match:
                     return str(cik_match.group(1)).zfill(10)
-        except:
-            pass
-    
-    return None
-    """
-    Fallback method to find CIK by searching SEC's website directly
-    """
-    try:
-        search_url = "https://www.sec.gov/edgar/searchedgar/companysearch.html"
-        # Use the browse-edgar endpoint for company search
-        browse_url = "https://www.sec.gov/cgi-bin/browse-edgar"
-        
-        params = {
-            'action': 'getcompany',
-            'CIK': ticker,
-            'type': '10-K',
-            'dateb': '',
-            'count': '1',
-            'output': 'xml'
-        }
-        
-        response = requests.get(browse_url, headers=HEADERS, params=params, timeout=15)
-        
-        if response.status_code == 200:
-            # Try to extract CIK from the response
-            soup = BeautifulSoup(response.content, 'xml')
-            # Look for CIK in the XML response
-            company_info = soup.find('company-info')
-            if company_info:
-                cik_elem = company_info.find('cik')
-                if cik_elem:
-                    return str(cik_elem.text).zfill(10)
-        
-    except Exception as e:
-        pass
+        except requests.RequestException as e:
+            logger.debug("Company name search failed for %s: %s", ticker, e)
     
     return None
 
+@cached(ttl_days=7, cache_if=bool)  # Short TTL so newly filed 10-Ks are picked up
 def search_10k_filings(ticker, max_filings=MAX_FILINGS_PER_TICKER):
     """
-    Search for 10-K filings using multiple methods
+    Search for 10-K filings via the SEC submissions API (one JSON request per ticker)
     """
-    # Method 1: Try with CIK lookup first
     cik = get_cik_from_ticker(ticker)
+    if not cik:
+        return []
     
-    if cik:
-        # Try the submissions API with CIK
-        try:
-            submissions_url = f"{EDGAR_API_BASE}/submissions/CIK{cik}.json"
-            response = requests.get(submissions_url, headers=HEADERS, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
-                recent_filings = data.get('filings', {}).get('recent', {})
-                
-                filings = []
-                forms = recent_filings.get('form', [])
-                accession_numbers = recent_filings.get('accessionNumber', [])
-                filing_dates = recent_filings.get('filingDate', [])
-                
-                for i, form in enumerate(forms):
-                    if form == '10-K' and len(filings) < max_filings:
-                        if i < len(accession_numbers) and i < len(filing_dates):
-                            filings.append({
-                                'cik': cik,
-                                'accession_number': accession_numbers[i],
-                                'filing_date': filing_dates[i],
-                                'report_date': filing_dates[i],
-                                'form': form
-                            })
-                
-                if filings:
-                    return filings
-        except Exception as e:
-            pass
-    
-    # Method 2: Direct ticker search via browse-edgar
     try:
-        search_url = "https://www.sec.gov/cgi-bin/browse-edgar"
-        params = {
-            'action': 'getcompany',
-            'ticker': ticker.upper(),
-            'type': '10-K',
-            'dateb': '',
-            'count': str(max_filings),
-            'search_text': ''
-        }
-        
-        response = requests.get(search_url, headers=HEADERS, params=params, timeout=15)
+        submissions_url = f"{EDGAR_API_BASE}/submissions/CIK{cik}.json"
+        response = sec_get(submissions_url, timeout=15)
         
         if response.status_code == 200:
-            # Parse HTML response to extract filing information
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for the filings table
-            filings_table = soup.find('table', class_='tableFile2')
-            if not filings_table:
-                filings_table = soup.find('table')  # Fallback to any table
+            data = orjson.loads(response.content)
+            recent_filings = data.get('filings', {}).get('recent', {})
             
             filings = []
-            if filings_table:
-                rows = filings_table.find_all('tr')
-                
-                for row in rows[1:max_filings+1]:  # Skip header row
-                    cells = row.find_all('td')
-                    if len(cells) >= 4:
-                        form_type = cells[0].get_text(strip=True)
-                        if form_type == '10-K':
-                            # Extract filing date
-                            filing_date = cells[3].get_text(strip=True) if len(cells) > 3 else 'Unknown'
-                            
-                            # Find the document link
-                            doc_link = cells[1].find('a')
-                            if doc_link and 'href' in doc_link.attrs:
-                                href = doc_link['href']
-                                # Extract accession number from URL
-                                accession_match = re.search(r'Accession-Number=([^&]+)', href)
-                                if not accession_match:
-                                    accession_match = re.search(r'/([0-9-]+)/', href)
-                                
-                                if accession_match:
-                                    accession_number = accession_match.group(1)
-                                    
-                                    # Extract CIK from URL if we don't have it
-                                    if not cik:
-                                        cik_match = re.search(r'CIK=([0-9]+)', href)
-                                        if cik_match:
-                                            cik = str(cik_match.group(1)).zfill(10)
-                                    
-                                    filings.append({
-                                        'cik': cik,
-                                        'accession_number': accession_number,
-                                        'filing_date': filing_date,
-                                        'report_date': filing_date,
-                                        'form': '10-K'
-                                    })
+            forms = recent_filings.get('form', [])
+            accession_numbers = recent_filings.get('accessionNumber', [])
+            filing_dates = recent_filings.get('filingDate', [])
+            primary_documents = recent_filings.get('primaryDocument', [])
             
-            if filings:
-                return filings
-                
+            for i, form in enumerate(forms):
+                if form == '10-K' and len(filings) < max_filings:
+                    if i < len(accession_numbers) and i < len(filing_dates):
+                        filings.append({
+                            'cik': cik,
+                            'accession_number': accession_numbers[i],
+                            'filing_date': filing_dates[i],
+                            'report_date': filing_dates[i],
+                            'primary_document': primary_documents[i] if i < len(primary_documents) else '',
+                            'form': form
+                        })
+            
+            return filings
     except Exception as e:
-        pass
+        logger.debug("Submissions lookup failed for %s: %s", ticker, e)
     
     return []
 
+def read_capped(response, max_bytes):
+    """
+    Stream a response body in 64KB chunks, stopping once max_bytes have been read,
+    so a huge filing is never held in memory in full. Returns a BytesIO.
+    """
+    buf = io.BytesIO()
+    for chunk in response.iter_content(chunk_size=65536):
+        buf.write(chunk)
+        if buf.tell() >= max_bytes:
+            break
+    response.close()
+    buf.seek(0)
+    return buf
+
+# Not disk-cached: the saved .txt files already let re-runs skip downloaded filings,
+# and caching the raw text would duplicate them uncapped (several GB per S&P run)
 def download_10k_document(filing_info, ticker):
     """
     Download the actual 10-K document text from SEC EDGAR - FIXED URL construction
@@ -269,72 +273,67 @@ def download_10k_document(filing_info, ticker):
         if not cik:
             return f"No CIK available for {ticker}"
         
-        # FIXED: Proper SEC EDGAR URL construction
+        # The submissions API names the primary document; fall back to the full submission text
         accession_clean = accession_number.replace('-', '')
+        filing_dir = f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{accession_clean}"
+        primary_document = filing_info.get('primary_document')
+        if primary_document:
+            url = f"{filing_dir}/{primary_document}"
+        else:
+            url = f"{filing_dir}/{accession_number}.txt"
         
-        # The correct SEC EDGAR URL format
-        urls_to_try = [
-            # Primary document (most common)
-            f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_clean}/{accession_number}-10-k.htm",
-            # Alternative formats
-            f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_clean}/{accession_number}.txt",
-            # Sometimes the file has a different naming pattern
-            f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_clean}/form10k.htm",
-            # Try the detail URL if available
-        ]
+        response = sec_get(url, timeout=20, stream=True)
         
-        # Add detail URL from filing info if available
-        if 'detail_url' in filing_info:
-            urls_to_try.insert(0, filing_info['detail_url'])
+        if response.status_code != 200:
+            response.close()
+            return f"Could not download 10-K document for {ticker}. HTTP {response.status_code} for {url}"
         
-        for url in urls_to_try:
-            try:
-                response = requests.get(url, headers=HEADERS, timeout=20)
-                
-                if response.status_code == 200:
-                    content_type = response.headers.get('content-type', '').lower()
-                    
-                    if 'html' in content_type or url.endswith('.htm'):
-                        # Parse HTML and extract text
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        # Remove unwanted elements
-                        for element in soup(['script', 'style', 'nav', 'header', 'footer']):
-                            element.decompose()
-                        
-                        # Get text content
-                        text = soup.get_text()
-                        
-                    else:
-                        # Plain text content
-                        text = response.text
-                    
-                    # Check if we got substantial content (10-K should be long)
-                    if len(text) > 10000:  # 10K+ characters minimum
-                        return text
-                        
-            except Exception as e:
-                continue
+        content_type = response.headers.get('content-type', '').lower()
+        
+        if 'html' in content_type or url.endswith('.htm'):
+            # Parse HTML with lxml directly (C parser, no BeautifulSoup tree on top)
+            root = lxml.html.parse(read_capped(response, MAX_HTML_BYTES)).getroot()
+            
+            # Remove unwanted elements (drop_tree keeps the text that follows them)
+            for element in list(root.iter('script', 'style', 'nav', 'header', 'footer')):
+                element.drop_tree()
+            
+            # Get text content
+            text = root.text_content()
+            
+        else:
+            # Plain text content
+            raw = read_capped(response, MAX_TEXT_BYTES).getvalue()
+            text = raw.decode(response.encoding or 'utf-8', errors='replace')
         
-        return f"Could not download 10-K document for {ticker}. All URLs failed."
+        # Check if we got substantial content (10-K should be long)
+        if len(text) > 10000:  # 10K+ characters minimum
+            return text
+        
+        return f"Could not download 10-K document for {ticker}. Document at {url} is too short."
         
     except Exception as e:
         return f"Error downloading 10-K document: {str(e)}"
 
+# Patterns used by clean_10k_text, compiled once at import
+_RE_BLANK = re.compile(r'\n\s*\n')
+_RE_WS = re.compile(r'[ \t]{2,}|\t')  # Single spaces are already clean, so don't rewrite them
+_RE_PAGENO_OR_HTML = re.compile(r'^\s*\d+\s*$|<[^>]+>', re.MULTILINE)  # Page numbers and leftover HTML tags
+_RE_SEC_HDR = re.compile(r'UNITED STATES\s*SECURITIES AND EXCHANGE COMMISSION.*?(?=FORM 10-K)', re.DOTALL | re.IGNORECASE)
+
 def clean_10k_text(text):
     """
     Clean and format 10-K text for better readability.
     """
     # Remove excessive whitespace
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = _RE_BLANK.sub('\n\n', text)
+    text = _RE_WS.sub(' ', text)
     
-    # Remove page markers and other artifacts
-    text = re.sub(r'^\s*\d+\s*$', '', text, flags=re.MULTILINE)
-    text = re.sub(r'<[^>]+>', '', text)  # Remove any remaining HTML tags
+    # Remove page markers and any remaining HTML tags in one pass
+    text = _RE_PAGENO_OR_HTML.sub('', text)
     
     # Remove SEC header/footer boilerplate
-    text = re.sub(r'UNITED STATES\s*SECURITIES AND EXCHANGE COMMISSION.*?(?=FORM 10-K)', '', text, flags=re.DOTALL | re.IGNORECASE)
+    text = _RE_SEC_HDR.sub('', text)
     
     # Limit length to avoid extremely large files
     if len(text) > 1000000:  # 1MB limit
@@ -342,6 +341,10 @@ def clean_10k_text(text):
     
     return text.strip()
 
+# Load the SEC ticker -> CIK mapping once for all tickers
+COMPANY_TICKERS = load_company_tickers()
+CIK_BY_TICKER = build_cik_index(COMPANY_TICKERS)
+
 # Load CSV file
 try:
     df = pd.read_csv(CSV_FILE)
@@ -356,21 +359,28 @@ except Exception as e:
 tickers_to_use = tickers  # Use this line for all tickers
 print(f"Using {len(tickers_to_use)} tickers: {', '.join(tickers_to_use)}")
 
-successful_tickers = 0
-for i, ticker in enumerate(tickers_to_use):
-    print(f"\n[{i+1}/{len(tickers_to_use)}] Processing {ticker}...")
+def process_ticker(i, ticker):
+    """
+    Download and save the 10-K filings for one ticker (blocking, runs in a worker thread).
+    Output is collected and printed in one block so concurrent tickers don't interleave.
+    Returns True if at least one filing was saved.
+    """
+    log = [f"\n[{i+1}/{len(tickers_to_use)}] Processing {ticker}..."]
     
     ticker_dir = os.path.join(OUTPUT_DIR, ticker)
     os.makedirs(ticker_dir, exist_ok=True)
+    hashes_path = os.path.join(ticker_dir, ".hashes")
+    saved_hashes = load_saved_hashes(hashes_path)
     
     # Search for 10-K filings
     filings = search_10k_filings(ticker)
     
     if not filings:
-        print(f"  No 10-K filings found for {ticker}")
-        continue
+        log.append(f"  No 10-K filings found for {ticker}")
+        print("\n".join(log))
+        return False
     
-    print(f"  Found {len(filings)} 10-K filings for {ticker}")
+    log.append(f"  Found {len(filings)} 10-K filings for {ticker}")
     
     success_count = 0
     for j, filing in enumerate(filings):
@@ -378,20 +388,32 @@ for i, ticker in enumerate(tickers_to_use):
             filing_date = filing.get('filing_date', 'Unknown')
             accession_number = filing.get('accession_number', 'Unknown')
             
-            print(f"    Processing 10-K filed {filing_date}...")
+            log.append(f"    Processing 10-K filed {filing_date}...")
+            
+            # Create filename
+            safe_date = filing_date.replace('-', '_')
+            filename = os.path.join(ticker_dir, f"{ticker}_10K_{safe_date}_{accession_number.replace('-', '_')}.txt")
+            
+            # Skip filings saved by a previous run
+            if os.path.exists(filename) and os.path.getsize(filename) > MIN_SAVED_FILING_BYTES:
+                success_count += 1
+                log.append(f"      ✓ Already saved, skipping")
+                continue
             
             # Download the 10-K document
             document_text = download_10k_document(filing, ticker)
             
-            if not document_text.startswith("Error") and not document_text.startswith("Could not"):
+            if is_downloaded_document(document_text):
                 success_count += 1
                 
                 # Clean the text
                 clean_text = clean_10k_text(document_text)
                 
-                # Create filename
-                safe_date = filing_date.replace('-', '_')
-                filename = os.path.join(ticker_dir, f"{ticker}_10K_{safe_date}_{accession_number.replace('-', '_')}.txt")
+                # Skip documents identical to one already saved (e.g. amendments resolving to the same document)
+                text_hash = content_hash(clean_text)
+                if text_hash in saved_hashes:
+                    log.append(f"      ✓ Same document as an already saved filing, skipping")
+                    continue
                 
                 # Save the filing
                 with open(filename, "w", encoding="utf-8") as f:
@@ -403,25 +425,36 @@ for i, ticker in enumerate(tickers_to_use):
                     f.write("="*80 + "\n\n")
                     f.write(clean_text)
                 
-                print(f"      ✓ Successfully saved 10-K filing ({len(clean_text):,} chars)")
+                saved_hashes.add(text_hash)
+                with open(hashes_path, "a", encoding="utf-8") as f:
+                    f.write(f"{text_hash} {os.path.basename(filename)}\n")
+                
+                log.append(f"      ✓ Successfully saved 10-K filing ({len(clean_text):,} chars)")
             else:
-                print(f"      ✗ Failed to download: {document_text}")
-            
-            # Delay between filings
-            time.sleep(random.uniform(*REQUEST_DELAY))
+                log.append(f"      ✗ Failed to download: {document_text}")
             
         except Exception as e:
-            print(f"      ✗ Error processing filing: {e}")
+            log.append(f"      ✗ Error processing filing: {e}")
             continue
     
-    if success_count > 0:
-        successful_tickers += 1
-    
-    print(f"  Completed {ticker}: {success_count}/{len(filings)} filings successfully saved")
-    
-    # Longer delay between tickers
-    if i < len(tickers_to_use) - 1:
-        time.sleep(random.uniform(2, 4))
+    log.append(f"  Completed {ticker}: {success_count}/{len(filings)} filings successfully saved")
+    print("\n".join(log))
+    return success_count > 0
+
+async def process_ticker_async(sem, i, ticker):
+    async with sem:
+        # No sleeps needed - SEC_LIMITER paces every request
+        return await asyncio.to_thread(process_ticker, i, ticker)
+
+async def main():
+    # Up to MAX_CONCURRENT_TICKERS tickers download at once; the blocking SESSION calls
+    # run in worker threads, which release the GIL while waiting on the network
+    sem = asyncio.Semaphore(MAX_CONCURRENT_TICKERS)
+    tasks = [asyncio.create_task(process_ticker_async(sem, i, ticker)) for i, ticker in enumerate(tickers_to_use)]
+    results = await asyncio.gather(*tasks)
+    return sum(results)
+
+successful_tickers = asyncio.run(main())
 
 print(f"\n10-K scraping completed!")
 print(f"Successfully processed {successful_tickers}/{len(tickers_to_use)} tickers")
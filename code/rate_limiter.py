@@ -0,0 +1,90 @@
+"""
+Leo Howard, Copyright 2025.
+
+Thread-safe token bucket used to pace API calls across worker threads.
+The bucket only slows down further when the server actually rate-limits us.
+
+Usage:
+limiter = TokenBucket(rate=5, per=1.0)  # 5 calls per second
+limiter.acquire()  # blocks until a token is available
+data = call_with_backoff(limiter, fetch_fn, rate_limit_errors=(SomeRateLimitError,))
+"""
+
+import time
+import threading
+
+class TokenBucket:
+    """
+    Allows `rate` calls every `per` seconds, with bursts of up to `rate` calls.
+    acquire() blocks the calling thread until a token is available.
+    After backoff() every caller waits out a pause that doubles on each
+    consecutive rate-limit hit, until reset_backoff() is called.
+    """
+
+    def __init__(self, rate, per=1.0, initial_backoff=1.0, max_backoff=60.0):
+        self.capacity = rate
+        self.fill_rate = rate / per  # tokens added per second
+        self.tokens = rate
+        self.last_refill = time.monotonic()
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff_delay = 0.0
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.fill_rate)
+        self.last_refill = now
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.fill_rate
+            # Sleep outside the lock so other threads can refill/check
+            time.sleep(wait)
+
+    def backoff(self):
+        """
+        Pause all callers after a rate-limit response. Threads hitting the limit during a
+        pause that is already running count as the same hit, so the delay doubles once per pause.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return
+            if self.backoff_delay:
+                self.backoff_delay = min(self.backoff_delay * 2, self.max_backoff)
+            else:
+                self.backoff_delay = self.initial_backoff
+            self.paused_until = now + self.backoff_delay
+            # Start refilling from the end of the pause so it doesn't come back as a full burst
+            self.tokens = 0
+            self.last_refill = self.paused_until
+
+    def reset_backoff(self):
+        """Clear the backoff after a successful call."""
+        with self.lock:
+            self.backoff_delay = 0.0
+
+# Call fetch_fn under the limiter, backing off and retrying when it is rate-limited
+def call_with_backoff(limiter, fetch_fn, rate_limit_errors, max_retries=3):
+    for attempt in range(max_retries + 1):
+        limiter.acquire()
+        try:
+            result = fetch_fn()
+        except rate_limit_errors:
+            if attempt == max_retries:
+                raise
+            limiter.backoff()
+            continue
+        limiter.reset_backoff()
+        return result
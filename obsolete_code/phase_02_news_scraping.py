@@ -8,30 +8,146 @@ Activate virtual env in Windows:
 finance_llm_python_venv/Scripts/activate
 python -c "import sys; print(sys.executable)"
 
-pip install feedparser beautifulsoup4 requests
+pip install lxml cssselect requests orjson
 
 python code/phase_02_news_scraping.py
+python code/phase_02_news_scraping.py --force  # delete saved articles and scrape them again
 """
 
 import os
+import argparse
 import time
+import asyncio
+import hashlib
+import logging
+import threading
 import pandas as pd
-import feedparser
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
 from datetime import datetime, timedelta
 import random
 import re
+import orjson
 from urllib.parse import unquote
 import shutil
+import tempfile
 
 CSV_FILE = "./data/02_va_sp500_filtered_by_net_income.csv"
 OUTPUT_DIR = os.path.join(".", "data", "news")
 MAX_ARTICLES = 5
 REQUEST_DELAY = (2, 4)  # Longer delays to avoid being blocked
+MAX_CONCURRENT_TICKERS = 8  # Tickers processed at the same time
+CACHE_DIR = os.path.join(".", "data", ".cache")
+ETAGS_PATH = os.path.join(CACHE_DIR, "etags.json")  # URL -> ETag/Last-Modified of the cached body
+BODY_CACHE_DIR = os.path.join(CACHE_DIR, "bodies")
+logger = logging.getLogger(__name__)
 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0'
+}
+
+# Accept-Encoding is left to requests (gzip, deflate): it can't decode br without the brotli package
+# One pooled session for every feed/article request so TCP/TLS connections are reused across calls
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=64,
+                       max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Boilerplate paragraphs (navigation, ads, etc.) - one case-insensitive pass per paragraph
+_SKIP_RE = re.compile(r'cookie|subscribe|sign up|advertisement|follow us|newsletter|privacy policy|terms of service|all rights reserved', re.IGNORECASE)
+
+# Article body selectors, compiled to XPath once. Container selectors are
+# extended with " p" so every selector yields the paragraphs directly.
+_CONTENT_SELECTORS = [CSSSelector(sel if sel.endswith(' p') else f'{sel} p') for sel in [
+    'div[data-module="ArticleBody"]',  # Yahoo Finance
+    '.caas-body',  # Yahoo
+    'div.article-body',
+    'div.story-body',
+    'div.entry-content',
+    'div.post-content',
+    'div.content-body',
+    'article',
+    '[role="main"] p',
+    '.article-content p',
+    '.story-content p'
+]]
+
+parser = argparse.ArgumentParser(description="Scrape recent news articles for the screened tickers")
+parser.add_argument("--force", action="store_true", help="Delete previously saved articles before running")
+args = parser.parse_args()
+
+# Existing articles are kept between runs and skipped (see process_ticker) unless --force is given
+if args.force:
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
-shutil.rmtree(OUTPUT_DIR, ignore_errors=True); os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+# Load the ETag/Last-Modified validators saved by previous runs
+def load_etags():
+    try:
+        with open(ETAGS_PATH, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+def save_etags():
+    with ETAGS_LOCK:
+        data = orjson.dumps(ETAGS)
+    with open(ETAGS_PATH, "wb") as f:
+        f.write(data)
+
+os.makedirs(BODY_CACHE_DIR, exist_ok=True)
+ETAGS = load_etags()
+ETAGS_LOCK = threading.Lock()
+
+def conditional_get(url, **kwargs):
+    """
+    GET a URL, sending the stored ETag/Last-Modified so an unchanged page comes back as an
+    empty 304 and is served from the body cached on disk. Returns (final_url, content).
+    """
+    body_path = os.path.join(BODY_CACHE_DIR, hashlib.md5(url.encode("utf-8")).hexdigest())
+    with ETAGS_LOCK:
+        validators = ETAGS.get(url)
+    
+    headers = {}
+    if validators and os.path.exists(body_path):
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    
+    response = SESSION.get(url, headers=headers, **kwargs)
+    if response.status_code == 304 and headers:
+        with open(body_path, "rb") as f:
+            return validators.get('final_url', url), f.read()
+    response.raise_for_status()
+    
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        # Write to a temp file and swap it in, so a thread serving a 304 for the same URL
+        # (e.g. the shared MarketWatch feed) never reads a half-written body
+        fd, tmp_path = tempfile.mkstemp(dir=BODY_CACHE_DIR)
+        with os.fdopen(fd, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp_path, body_path)
+        with ETAGS_LOCK:
+            ETAGS[url] = {'etag': etag, 'last_modified': last_modified, 'final_url': response.url}
+    return response.url, response.content
 
 def decode_google_news_url(url):
     """Attempt to decode Google News URL to get the actual article URL"""
@@ -39,15 +155,12 @@ def decode_google_news_url(url):
         # Method 1: Look for URL in the Google News redirect
         if 'news.google.com' in url and '/articles/' in url:
             # Try to make a request to Google News URL and follow redirects
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
             try:
-                response = requests.get(url, headers=headers, allow_redirects=False, timeout=10)
+                response = SESSION.get(url, allow_redirects=False, timeout=10)
                 if 'location' in response.headers:
                     return response.headers['location']
-            except:
-                pass
+            except requests.RequestException as e:
+                logger.debug("Google News redirect lookup failed for %s: %s", url, e)
         
         # Method 2: Try to extract URL from the encoded part
         if '/articles/' in url:
@@ -56,9 +169,41 @@ def decode_google_news_url(url):
             pass
             
         return url
-    except:
+    except Exception:
         return url
 
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+# Tolerant XML parser for feeds; never resolves external entities
+FEED_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+
+def fetch_feed_entries(url):
+    """Fetch an RSS feed (or Atom as a fallback) and return its entries as title/link/published dicts"""
+    _, content = conditional_get(url, timeout=10)
+    root = etree.fromstring(content, FEED_PARSER)
+    if root is None:
+        return []
+    
+    entries = []
+    items = root.findall('.//item')
+    if items:
+        for item in items:
+            entries.append({
+                'title': (item.findtext('title') or '').strip(),
+                'link': (item.findtext('link') or '').strip(),
+                'published': item.findtext('pubDate') or 'Unknown'
+            })
+        return entries
+    
+    # Atom feed: <entry> with the URL in <link href="...">
+    for entry in root.iter(f'{ATOM_NS}entry'):
+        link = entry.find(f'{ATOM_NS}link')
+        entries.append({
+            'title': (entry.findtext(f'{ATOM_NS}title') or '').strip(),
+            'link': link.get('href', '') if link is not None else '',
+            'published': entry.findtext(f'{ATOM_NS}published') or entry.findtext(f'{ATOM_NS}updated') or 'Unknown'
+        })
+    return entries
+
 def get_alternative_news_sources(ticker):
     """Get news from alternative sources like Yahoo Finance"""
     articles = []
@@ -67,142 +212,83 @@ def get_alternative_news_sources(ticker):
     yahoo_rss = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US"
     
     try:
-        feed = feedparser.parse(yahoo_rss)
-        for entry in feed.entries[:MAX_ARTICLES]:
-            articles.append({
-                'title': entry.title,
-                'link': entry.link,
-                'published': entry.get('published', 'Unknown'),
-                'source': 'Yahoo Finance'
-            })
+        for entry in fetch_feed_entries(yahoo_rss)[:MAX_ARTICLES]:
+            articles.append({**entry, 'source': 'Yahoo Finance'})
     except Exception as e:
         # print(f"    Error with Yahoo Finance RSS: {e}")
+        pass
     
     # MarketWatch RSS (they often have good RSS feeds)
     try:
         marketwatch_rss = f"https://feeds.marketwatch.com/marketwatch/topstories/"
-        feed = feedparser.parse(marketwatch_rss)
-        ticker_articles = [entry for entry in feed.entries if ticker.upper() in entry.title.upper()]
+        ticker_articles = [entry for entry in fetch_feed_entries(marketwatch_rss) if ticker.upper() in entry['title'].upper()]
         
         for entry in ticker_articles[:MAX_ARTICLES//2]:
-            articles.append({
-                'title': entry.title,
-                'link': entry.link,
-                'published': entry.get('published', 'Unknown'),
-                'source': 'MarketWatch'
-            })
+            articles.append({**entry, 'source': 'MarketWatch'})
     except Exception as e:
         # print(f"    Error with MarketWatch RSS: {e}")
+        pass
     
     return articles
 
 def extract_article_content(url, timeout=15):
     """Extract article content with better handling for different news sites"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Sec-Fetch-Dest': 'document',
-        'Sec-Fetch-Mode': 'navigate',
-        'Sec-Fetch-Site': 'none',
-        'Cache-Control': 'max-age=0'
-    }
-    
     try:
         # print(f"    Attempting to scrape: {url[:100]}...")
         
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        response = session.get(url, timeout=timeout, allow_redirects=True)
-        response.raise_for_status()
+        final_url, content = conditional_get(url, timeout=timeout, allow_redirects=True)
         
         # Check if we got redirected to a paywall or login page
-        final_url = response.url.lower()
+        final_url = final_url.lower()
         if any(blocked in final_url for blocked in ['paywall', 'subscribe', 'login', 'register']):
             return "Content blocked by paywall or subscription requirement."
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove unwanted elements
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement', 'ads']):
-            element.decompose()
+        root = lxml.html.fromstring(content)  # C-based parser, no BeautifulSoup tree on top
         
         # Try multiple approaches to find article content
         content_text = ""
         
-        # Method 1: Look for JSON-LD structured data
-        json_scripts = soup.find_all('script', type='application/ld+json')
+        # Method 1: Look for JSON-LD structured data (before the script tags are dropped below)
+        # A truncated articleBody (teaser) is ignored so the selector fallbacks still run
+        json_scripts = root.xpath('//script[@type="application/ld+json"]')
         for script in json_scripts:
             try:
-                import json
-                data = json.loads(script.string)
-                if isinstance(data, dict) and 'articleBody' in data:
-                    content_text = data['articleBody']
-                    break
-                elif isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict) and 'articleBody' in item:
-                            content_text = item['articleBody']
-                            break
-            except:
+                data = orjson.loads(script.text or '{}')
+            except orjson.JSONDecodeError:
                 continue
+            items = data if isinstance(data, list) else [data]
+            bodies = [item['articleBody'] for item in items
+                      if isinstance(item, dict) and isinstance(item.get('articleBody'), str)]
+            content_text = next((body for body in bodies if len(body) > 200), "")
+            if content_text:
+                break
+        
+        # Remove unwanted elements (drop_tree keeps the text that follows them)
+        for element in list(root.iter('script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement', 'ads')):
+            element.drop_tree()
         
         # Method 2: Try various content selectors
         if not content_text:
-            content_selectors = [
-                'div[data-module="ArticleBody"]',  # Yahoo Finance
-                '.caas-body',  # Yahoo
-                'div.article-body',
-                'div.story-body',
-                'div.entry-content',
-                'div.post-content',
-                'div.content-body',
-                'article',
-                '[role="main"] p',
-                '.article-content p',
-                '.story-content p'
-            ]
-            
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    if selector.endswith(' p'):
-                        # For paragraph selectors
-                        paragraphs = elements
-                    else:
-                        # For container selectors
-                        paragraphs = []
-                        for element in elements:
-                            paragraphs.extend(element.find_all('p'))
-                    
-                    texts = []
-                    for p in paragraphs:
-                        text = p.get_text().strip()
-                        if len(text) > 30 and not any(skip in text.lower() for skip in ['subscribe', 'sign up', 'advertisement', 'cookie']):
-                            texts.append(text)
-                    
-                    if len(texts) > 2:  # Need at least 3 substantial paragraphs
-                        content_text = '\n\n'.join(texts)
-                        break
+            for selector in _CONTENT_SELECTORS:
+                texts = []
+                for p in selector(root):
+                    text = p.text_content().strip()
+                    if len(text) > 30 and not _SKIP_RE.search(text):
+                        texts.append(text)
+                
+                if len(texts) > 2:  # Need at least 3 substantial paragraphs
+                    content_text = '\n\n'.join(texts)
+                    break
         
         # Method 3: Fallback to all paragraphs
         if not content_text:
-            all_paragraphs = soup.find_all('p')
+            all_paragraphs = root.iter('p')
             substantial_paragraphs = []
             
             for p in all_paragraphs:
-                text = p.get_text().strip()
+                text = p.text_content().strip()
                 # Filter out navigation, ads, etc.
-                if (len(text) > 50 and 
-                    not any(skip in text.lower() for skip in [
-                        'cookie', 'subscribe', 'sign up', 'advertisement', 'follow us',
-                        'newsletter', 'privacy policy', 'terms of service', 'all rights reserved'
-                    ])):
+                if len(text) > 50 and not _SKIP_RE.search(text):
                     substantial_paragraphs.append(text)
             
             if len(substantial_paragraphs) >= 2:
@@ -232,12 +318,16 @@ except Exception as e:
 tickers_to_use = tickers
 print(f"Using {len(tickers_to_use)} tickers: {', '.join(tickers_to_use)}")
 
-for i, ticker in enumerate(tickers_to_use):
+def process_ticker(i, ticker):
+    """Fetch and save the news articles for one ticker (blocking, runs in a worker thread)"""
     # print(f"\n[{i+1}/{len(tickers_to_use)}] Processing {ticker}...")
     
     ticker_dir = os.path.join(OUTPUT_DIR, ticker)
     os.makedirs(ticker_dir, exist_ok=True)
     
+    # Titles saved by a previous run: "<ticker>_<n>_<safe_title>.txt" -> "<safe_title>.txt"
+    saved_titles = {name[len(ticker)+1:].split('_', 1)[-1] for name in os.listdir(ticker_dir)}
+    
     # Try alternative news sources first (they're more reliable)
     articles = get_alternative_news_sources(ticker)
     
@@ -245,21 +335,15 @@ for i, ticker in enumerate(tickers_to_use):
     if len(articles) < MAX_ARTICLES:
         try:
             google_rss = f"https://news.google.com/rss/search?q={ticker}+stock&hl=en&gl=US&ceid=US:en"
-            feed = feedparser.parse(google_rss)
-            
-            for entry in feed.entries[:MAX_ARTICLES-len(articles)]:
-                articles.append({
-                    'title': entry.title,
-                    'link': entry.link,
-                    'published': entry.get('published', 'Unknown'),
-                    'source': 'Google News'
-                })
+            for entry in fetch_feed_entries(google_rss)[:MAX_ARTICLES-len(articles)]:
+                articles.append({**entry, 'source': 'Google News'})
         except Exception as e:
             # print(f"  Error with Google News: {e}")
+            pass
     
     if not articles:
         # print(f"  No articles found for {ticker}")
-        continue
+        return 0
     
     count = 0
     for j, article in enumerate(articles):
@@ -275,12 +359,17 @@ for i, ticker in enumerate(tickers_to_use):
                 # print(f"    Skipping Google News redirect URL")
                 continue
             
+            # Skip articles saved by a previous run
+            safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()[:40]
+            if f"{safe_title}.txt" in saved_titles:
+                count += 1
+                continue
+            
             # Extract content
             article_text = extract_article_content(link)
             
             if "error" not in article_text.lower() and len(article_text) > 200:
                 count += 1
-                safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()[:40]
                 filename = os.path.join(ticker_dir, f"{ticker}_{count}_{safe_title}.txt")
                 
                 with open(filename, "w", encoding="utf-8") as f:
@@ -296,6 +385,7 @@ for i, ticker in enumerate(tickers_to_use):
                 # print(f"    ✓ Successfully saved article {count} ({len(article_text)} chars)")
             else:
                 # print(f"    ✗ Content extraction failed or insufficient content")
+                pass
             
             # Delay between articles
             time.sleep(random.uniform(*REQUEST_DELAY))
@@ -306,9 +396,24 @@ for i, ticker in enumerate(tickers_to_use):
     
     # print(f"  Completed {ticker}: {count} articles successfully saved")
     
-    # Longer delay between tickers
-    if i < len(tickers_to_use) - 1:
-        time.sleep(random.uniform(3, 6))
+    return count
+
+async def process_ticker_async(sem, i, ticker):
+    async with sem:
+        count = await asyncio.to_thread(process_ticker, i, ticker)
+        # Longer delay before this slot picks up the next ticker
+        await asyncio.sleep(random.uniform(3, 6))
+        return count
+
+async def main():
+    # Up to MAX_CONCURRENT_TICKERS tickers are scraped at once; the blocking SESSION calls
+    # run in worker threads, which release the GIL while waiting on the network
+    sem = asyncio.Semaphore(MAX_CONCURRENT_TICKERS)
+    tasks = [asyncio.create_task(process_ticker_async(sem, i, ticker)) for i, ticker in enumerate(tickers_to_use)]
+    return await asyncio.gather(*tasks)
+
+asyncio.run(main())
+save_etags()  # Validators for the next run's conditional GETs
 
 print(f"\nScraping test completed! Check '{OUTPUT_DIR}' directory for results.")
 print("If this works well, you can increase the number of tickers_to_use or remove the limit.")
\ No newline at end of file